@@ -1,20 +1,19 @@
-import contextlib
-import json
 import logging
-import traceback
 
 from abc import ABC, abstractmethod
-from collections.abc import AsyncGenerator
-from typing import Any
+from collections.abc import AsyncGenerator, Callable, Iterator, Mapping
+from typing import Any, ClassVar, get_args
 
 from fastapi import FastAPI
-from pydantic import ValidationError
-from sse_starlette.sse import EventSourceResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 from starlette.applications import Starlette
 from starlette.authentication import BaseUser
+from starlette.datastructures import Headers
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import Response
 from starlette.status import HTTP_413_REQUEST_ENTITY_TOO_LARGE
 
 from a2a.auth.user import UnauthenticatedUser
@@ -23,24 +22,29 @@ from a2a.server.context import ServerCallContext
 from a2a.server.request_handlers.jsonrpc_handler import JSONRPCHandler
 from a2a.server.request_handlers.request_handler import RequestHandler
 from a2a.types import (
-    A2AError,
     A2ARequest,
     AgentCard,
     CancelTaskRequest,
+    ContentTypeNotSupportedError,
     DeleteTaskPushNotificationConfigRequest,
     GetTaskPushNotificationConfigRequest,
     GetTaskRequest,
     InternalError,
+    InvalidAgentResponseError,
+    InvalidParamsError,
     InvalidRequestError,
     JSONParseError,
     JSONRPCError,
     JSONRPCErrorResponse,
-    JSONRPCResponse,
     ListTaskPushNotificationConfigRequest,
+    MethodNotFoundError,
+    PushNotificationNotSupportedError,
     SendMessageRequest,
     SendStreamingMessageRequest,
     SendStreamingMessageResponse,
     SetTaskPushNotificationConfigRequest,
+    TaskNotCancelableError,
+    TaskNotFoundError,
     TaskResubscriptionRequest,
     UnsupportedOperationError,
 )
@@ -54,17 +58,109 @@ from a2a.utils.errors import MethodNotImplementedError
 
 logger = logging.getLogger(__name__)
 
+# Maximum time, in seconds, to wait for a client to accept an SSE chunk.
+_SSE_SEND_TIMEOUT = 30
+
+# Pre-encoded bodies for the authenticated extended agent card 404 responses.
+_EXTENDED_CARD_NOT_SUPPORTED_BODY = (
+    b'{"error":"Extended agent card not supported or not enabled."}'
+)
+_EXTENDED_CARD_NOT_CONFIGURED_BODY = (
+    b'{"error":"Authenticated extended agent card is supported but not'
+    b' configured on the server."}'
+)
+
+
+class _JSONRPCEnvelope(BaseModel):
+    """The JSON-RPC fields needed to route a request before validating it."""
+
+    id: str | int | None = None
+    method: str | None = None
+
+
+def _peek_envelope(body: Any) -> _JSONRPCEnvelope | None:
+    """Extracts the routing fields from a parsed request body.
+
+    Args:
+        body: The parsed JSON request body.
+
+    Returns:
+        The `_JSONRPCEnvelope`, or None if the body is not a JSON object or
+        its `id` or `method` have invalid types.
+    """
+    try:
+        return _JSONRPCEnvelope.model_validate(body)
+    except ValidationError:
+        return None
+
+
+# Maps each JSON-RPC method name to a TypeAdapter for the concrete request
+# type in the A2ARequest union, so a request can be validated against just
+# that type. The adapters are built once and reused for every request.
+_METHOD_TO_ADAPTER: dict[str, TypeAdapter[Any]] = {
+    request_type.model_fields['method'].default: TypeAdapter(request_type)
+    for request_type in get_args(A2ARequest.model_fields['root'].annotation)
+}
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Creates a JSON Response directly from a Pydantic model.
+
+    The model is serialized to JSON bytes in a single pydantic-core pass,
+    without materializing an intermediate Python dict.
+
+    Args:
+        model: The Pydantic model to serialize.
+
+    Returns:
+        A `Response` with the serialized model and a JSON media type.
+    """
+    return Response(
+        content=model.model_dump_json(exclude_none=True),
+        media_type='application/json',
+        status_code=200,
+    )
+
+
+class _HeadersView(Mapping[str, str]):
+    """A read-only mapping view over the headers of a Starlette Request.
+
+    Avoids copying every header into a new dict for each request; lookups
+    are delegated to the underlying (case-insensitive) `Headers` object.
+    """
+
+    __slots__ = ('_headers',)
+
+    def __init__(self, headers: Headers):
+        self._headers = headers
+
+    def __getitem__(self, key: str) -> str:
+        """Returns the value of the given header."""
+        return self._headers[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the distinct (lower-cased) header names."""
+        # Repeated headers appear once, matching `dict(request.headers)`.
+        return iter(dict.fromkeys(self._headers.keys()))
+
+    def __len__(self) -> int:
+        """Returns the number of distinct header names."""
+        return len(set(self._headers.keys()))
+
 
 class StarletteUserProxy(A2AUser):
-    """Adapts the Starlette User class to the A2A user representation."""
+    """Adapts the Starlette User class to the A2A user representation.
+
+    `is_authenticated` is read once at construction and stored in a slot.
+    `user_name` is only read from the Starlette user on access, since many
+    Starlette users do not implement `display_name`.
+    """
+
+    __slots__ = ('_user', 'is_authenticated')
 
     def __init__(self, user: BaseUser):
         self._user = user
-
-    @property
-    def is_authenticated(self) -> bool:
-        """Returns whether the current user is authenticated."""
-        return self._user.is_authenticated
+        self.is_authenticated: bool = user.is_authenticated
 
     @property
     def user_name(self) -> str:
@@ -95,10 +191,14 @@ class DefaultCallContextBuilder(CallContextBuilder):
         """
         user: A2AUser = UnauthenticatedUser()
         state = {}
-        with contextlib.suppress(Exception):
+        # `request.user` and `request.auth` raise unless an authentication
+        # middleware populated the scope, so check the scope directly rather
+        # than raising and suppressing an exception on every request.
+        if 'user' in request.scope:
             user = StarletteUserProxy(request.user)
+        if 'auth' in request.scope:
             state['auth'] = request.auth
-        state['headers'] = dict(request.headers)
+        state['headers'] = _HeadersView(request.headers)
         return ServerCallContext(user=user, state=state)
 
 
@@ -110,6 +210,10 @@ class JSONRPCApplication(ABC):
     (SSE).
     """
 
+    # Requests whose declared Content-Length exceeds this many bytes are
+    # rejected before the body is read. Subclasses may override it.
+    MAX_BODY_BYTES: ClassVar[int] = 10 * 1024 * 1024
+
     def __init__(
         self,
         agent_card: AgentCard,
@@ -128,9 +232,22 @@ class JSONRPCApplication(ABC):
             context_builder: The CallContextBuilder used to construct the
               ServerCallContext passed to the http_handler. If None, no
               ServerCallContext is passed.
+
+        The agent cards are serialized once here; they must not be mutated
+        after the application has been initialized.
         """
         self.agent_card = agent_card
         self.extended_agent_card = extended_agent_card
+        self._agent_card_json = agent_card.model_dump_json(
+            exclude_none=True, by_alias=True
+        ).encode()
+        self._extended_agent_card_json = (
+            extended_agent_card.model_dump_json(
+                exclude_none=True, by_alias=True
+            ).encode()
+            if extended_agent_card
+            else None
+        )
         self.handler = JSONRPCHandler(
             agent_card=agent_card, request_handler=http_handler
         )
@@ -142,42 +259,73 @@ class JSONRPCApplication(ABC):
                 'AgentCard.supportsAuthenticatedExtendedCard is True, but no extended_agent_card was provided. The /agent/authenticatedExtendedCard endpoint will return 404.'
             )
         self._context_builder = context_builder or DefaultCallContextBuilder()
+        self._build_context = self._context_builder.build
+
+        # Map each request type to the bound handler method that serves it,
+        # so dispatching a request is a single dict lookup and call.
+        handler = self.handler
+        self._non_streaming_dispatch: dict[type, Callable[..., Any]] = {
+            SendMessageRequest: handler.on_message_send,
+            CancelTaskRequest: handler.on_cancel_task,
+            GetTaskRequest: handler.on_get_task,
+            SetTaskPushNotificationConfigRequest: handler.set_push_notification_config,
+            GetTaskPushNotificationConfigRequest: handler.get_push_notification_config,
+            ListTaskPushNotificationConfigRequest: handler.list_push_notification_config,
+            DeleteTaskPushNotificationConfigRequest: handler.delete_push_notification_config,
+        }
+        self._streaming_dispatch: dict[type, Callable[..., Any]] = {
+            SendStreamingMessageRequest: handler.on_message_send_stream,
+            TaskResubscriptionRequest: handler.on_resubscribe_to_task,
+        }
 
     def _generate_error_response(
-        self, request_id: str | int | None, error: JSONRPCError | A2AError
-    ) -> JSONResponse:
-        """Creates a Starlette JSONResponse for a JSON-RPC error.
+        self,
+        request_id: str | int | None,
+        error: (
+            JSONRPCError
+            | JSONParseError
+            | InvalidRequestError
+            | MethodNotFoundError
+            | InvalidParamsError
+            | InternalError
+            | TaskNotFoundError
+            | TaskNotCancelableError
+            | PushNotificationNotSupportedError
+            | UnsupportedOperationError
+            | ContentTypeNotSupportedError
+            | InvalidAgentResponseError
+        ),
+    ) -> Response:
+        """Creates a Starlette JSON Response for a JSON-RPC error.
 
         Logs the error based on its type.
 
         Args:
             request_id: The ID of the request that caused the error.
-            error: The `JSONRPCError` or `A2AError` object.
+            error: The specific A2A or JSON-RPC error model instance.
 
         Returns:
-            A `JSONResponse` object formatted as a JSON-RPC error response.
+            A JSON `Response` object formatted as a JSON-RPC error response.
         """
-        error_resp = JSONRPCErrorResponse(
-            id=request_id,
-            error=error if isinstance(error, JSONRPCError) else error.root,
-        )
+        error_resp = JSONRPCErrorResponse(id=request_id, error=error)
 
         log_level = (
             logging.ERROR
-            if not isinstance(error, A2AError)
-            or isinstance(error.root, InternalError)
+            if isinstance(error, JSONRPCError | InternalError)
             else logging.WARNING
         )
-        logger.log(
-            log_level,
-            f'Request Error (ID: {request_id}): '
-            f"Code={error_resp.error.code}, Message='{error_resp.error.message}'"
-            f'{", Data=" + str(error_resp.error.data) if error_resp.error.data else ""}',
-        )
-        return JSONResponse(
-            error_resp.model_dump(mode='json', exclude_none=True),
-            status_code=200,
-        )
+        if logger.isEnabledFor(log_level):
+            logger.log(
+                log_level,
+                "Request Error (ID: %s): Code=%s, Message='%s'%s",
+                request_id,
+                error_resp.error.code,
+                error_resp.error.message,
+                f', Data={error_resp.error.data}'
+                if error_resp.error.data
+                else '',
+            )
+        return _json_response(error_resp)
 
     async def _handle_requests(self, request: Request) -> Response:  # noqa: PLR0911
         """Handles incoming POST requests to the main A2A endpoint.
@@ -191,257 +339,200 @@ class JSONRPCApplication(ABC):
             request: The incoming Starlette Request object.
 
         Returns:
-            A Starlette Response object (JSONResponse or EventSourceResponse).
+            A Starlette Response object (JSON Response or EventSourceResponse).
 
         Raises:
             (Implicitly handled): Various exceptions are caught and converted
             into JSON-RPC error responses by this method.
         """
         request_id = None
-        body = None
-
-        try:
-            body = await request.json()
-            a2a_request = A2ARequest.model_validate(body)
-            call_context = self._context_builder.build(request)
 
-            request_id = a2a_request.root.id
-            request_obj = a2a_request.root
+        content_length = request.headers.get('content-length')
+        if (
+            content_length
+            and content_length.isascii()
+            and content_length.isdigit()
+            and int(content_length) > self.MAX_BODY_BYTES
+        ):
+            return self._generate_error_response(
+                None, InvalidRequestError(message='Payload too large')
+            )
 
-            if isinstance(
-                request_obj,
-                TaskResubscriptionRequest | SendStreamingMessageRequest,
-            ):
+        try:
+            # Parse the body once; the envelope and the request are both
+            # validated from the resulting Python objects.
+            try:
+                body = from_json(await request.body())
+            except ValueError as e:
+                return self._generate_error_response(
+                    None, JSONParseError(message=str(e))
+                )
+            # Peek at the method so the body is validated against a single
+            # request type instead of trying every member of the union.
+            envelope = _peek_envelope(body)
+            adapter = None
+            if envelope is not None:
+                request_id = envelope.id
+                adapter = _METHOD_TO_ADAPTER.get(envelope.method or '')
+            if adapter is not None:
+                request_obj = adapter.validate_python(body)
+            else:
+                # Not a routable request object (unknown or missing method, or
+                # not a JSON object at all): fall back to the full union so
+                # the client receives the same validation error as before.
+                request_obj = A2ARequest.model_validate(body).root
+            call_context = self._build_context(request)
+
+            if type(request_obj) in self._streaming_dispatch:
                 return await self._process_streaming_request(
-                    request_id, a2a_request, call_context
+                    request_id, request_obj, call_context
                 )
 
             return await self._process_non_streaming_request(
-                request_id, a2a_request, call_context
+                request_id, request_obj, call_context
             )
         except MethodNotImplementedError:
-            traceback.print_exc()
+            logger.debug('Method not implemented', exc_info=True)
             return self._generate_error_response(
-                request_id, A2AError(root=UnsupportedOperationError())
-            )
-        except json.decoder.JSONDecodeError as e:
-            traceback.print_exc()
-            return self._generate_error_response(
-                None, A2AError(root=JSONParseError(message=str(e)))
+                request_id, UnsupportedOperationError()
             )
         except ValidationError as e:
-            traceback.print_exc()
+            logger.debug('Request validation failed', exc_info=True)
             return self._generate_error_response(
                 request_id,
-                A2AError(root=InvalidRequestError(data=json.loads(e.json()))),
+                InvalidRequestError(data=e.errors(include_url=False)),
             )
         except HTTPException as e:
             if e.status_code == HTTP_413_REQUEST_ENTITY_TOO_LARGE:
                 return self._generate_error_response(
                     request_id,
-                    A2AError(
-                        root=InvalidRequestError(message='Payload too large')
-                    ),
+                    InvalidRequestError(message='Payload too large'),
                 )
             raise e
         except Exception as e:
-            logger.error(f'Unhandled exception: {e}')
-            traceback.print_exc()
+            logger.exception('Unhandled exception: %s', e)
             return self._generate_error_response(
-                request_id, A2AError(root=InternalError(message=str(e)))
+                request_id, InternalError(message=str(e))
             )
 
     async def _process_streaming_request(
         self,
         request_id: str | int | None,
-        a2a_request: A2ARequest,
+        request_obj: SendStreamingMessageRequest | TaskResubscriptionRequest,
         context: ServerCallContext,
     ) -> Response:
         """Processes streaming requests (message/stream or tasks/resubscribe).
 
         Args:
             request_id: The ID of the request.
-            a2a_request: The validated A2ARequest object.
+            request_obj: The validated streaming request object.
             context: The ServerCallContext for the request.
 
         Returns:
             An `EventSourceResponse` object to stream results to the client.
         """
-        request_obj = a2a_request.root
-        handler_result: Any = None
-        if isinstance(
-            request_obj,
-            SendStreamingMessageRequest,
-        ):
-            handler_result = self.handler.on_message_send_stream(
-                request_obj, context
-            )
-        elif isinstance(request_obj, TaskResubscriptionRequest):
-            handler_result = self.handler.on_resubscribe_to_task(
-                request_obj, context
-            )
+        handler_result: Any = self._streaming_dispatch[type(request_obj)](
+            request_obj, context
+        )
 
         return self._create_response(handler_result)
 
     async def _process_non_streaming_request(
         self,
         request_id: str | int | None,
-        a2a_request: A2ARequest,
+        request_obj: Any,
         context: ServerCallContext,
     ) -> Response:
         """Processes non-streaming requests (message/send, tasks/get, tasks/cancel, tasks/pushNotificationConfig/*).
 
+        Awaits the handler and serializes its result straight into the
+        response body.
+
         Args:
             request_id: The ID of the request.
-            a2a_request: The validated A2ARequest object.
+            request_obj: The validated non-streaming request object.
             context: The ServerCallContext for the request.
 
         Returns:
-            A `JSONResponse` object containing the result or error.
+            A JSON `Response` object containing the result or error.
         """
-        request_obj = a2a_request.root
-        handler_result: Any = None
-        match request_obj:
-            case SendMessageRequest():
-                handler_result = await self.handler.on_message_send(
-                    request_obj, context
-                )
-            case CancelTaskRequest():
-                handler_result = await self.handler.on_cancel_task(
-                    request_obj, context
-                )
-            case GetTaskRequest():
-                handler_result = await self.handler.on_get_task(
-                    request_obj, context
-                )
-            case SetTaskPushNotificationConfigRequest():
-                handler_result = (
-                    await self.handler.set_push_notification_config(
-                        request_obj,
-                        context,
-                    )
-                )
-            case GetTaskPushNotificationConfigRequest():
-                handler_result = (
-                    await self.handler.get_push_notification_config(
-                        request_obj,
-                        context,
-                    )
-                )
-            case ListTaskPushNotificationConfigRequest():
-                handler_result = (
-                    await self.handler.list_push_notification_config(
-                        request_obj,
-                        context,
-                    )
-                )
-            case DeleteTaskPushNotificationConfigRequest():
-                handler_result = (
-                    await self.handler.delete_push_notification_config(
-                        request_obj,
-                        context,
-                    )
-                )
-            case _:
-                logger.error(
-                    f'Unhandled validated request type: {type(request_obj)}'
-                )
-                error = UnsupportedOperationError(
-                    message=f'Request type {type(request_obj).__name__} is unknown.'
-                )
-                handler_result = JSONRPCErrorResponse(
-                    id=request_id, error=error
-                )
-
-        return self._create_response(handler_result)
+        handler = self._non_streaming_dispatch.get(type(request_obj))
+        if handler is not None:
+            handler_result = await handler(request_obj, context)
+            return _json_response(handler_result.root)
+
+        logger.error(f'Unhandled validated request type: {type(request_obj)}')
+        error = UnsupportedOperationError(
+            message=f'Request type {type(request_obj).__name__} is unknown.'
+        )
+        return _json_response(JSONRPCErrorResponse(id=request_id, error=error))
 
     def _create_response(
         self,
-        handler_result: (
-            AsyncGenerator[SendStreamingMessageResponse]
-            | JSONRPCErrorResponse
-            | JSONRPCResponse
-        ),
-    ) -> Response:
-        """Creates a Starlette Response based on the result from the request handler.
-
-        Handles:
-        - AsyncGenerator for Server-Sent Events (SSE).
-        - JSONRPCErrorResponse for explicit errors returned by handlers.
-        - Pydantic RootModels (like GetTaskResponse) containing success or error
-        payloads.
+        handler_result: AsyncGenerator[SendStreamingMessageResponse],
+    ) -> EventSourceResponse:
+        """Creates a Server-Sent Events response from a streaming handler result.
 
         Args:
-            handler_result: The result from a request handler method. Can be an
-                async generator for streaming or a Pydantic model for non-streaming.
+            handler_result: The async generator of
+                `SendStreamingMessageResponse` objects returned by a streaming
+                request handler method.
 
         Returns:
-            A Starlette JSONResponse or EventSourceResponse.
+            An `EventSourceResponse` that streams each item as an SSE event.
         """
-        if isinstance(handler_result, AsyncGenerator):
-            # Result is a stream of SendStreamingMessageResponse objects
-            async def event_generator(
-                stream: AsyncGenerator[SendStreamingMessageResponse],
-            ) -> AsyncGenerator[dict[str, str]]:
-                async for item in stream:
-                    yield {'data': item.root.model_dump_json(exclude_none=True)}
-
-            return EventSourceResponse(event_generator(handler_result))
-        if isinstance(handler_result, JSONRPCErrorResponse):
-            return JSONResponse(
-                handler_result.model_dump(
-                    mode='json',
-                    exclude_none=True,
+
+        async def event_generator(
+            stream: AsyncGenerator[SendStreamingMessageResponse],
+        ) -> AsyncGenerator[ServerSentEvent]:
+            async for item in stream:
+                yield ServerSentEvent(
+                    data=item.root.model_dump_json(exclude_none=True)
                 )
-            )
 
-        return JSONResponse(
-            handler_result.root.model_dump(mode='json', exclude_none=True)
+        return EventSourceResponse(
+            event_generator(handler_result),
+            send_timeout=_SSE_SEND_TIMEOUT,
         )
 
-    async def _handle_get_agent_card(self, request: Request) -> JSONResponse:
+    async def _handle_get_agent_card(self, request: Request) -> Response:
         """Handles GET requests for the agent card endpoint.
 
         Args:
             request: The incoming Starlette Request object.
 
         Returns:
-            A JSONResponse containing the agent card data.
+            A JSON Response containing the agent card data.
         """
         # The public agent card is a direct serialization of the agent_card
-        # provided at initialization.
-        return JSONResponse(
-            self.agent_card.model_dump(
-                exclude_none=True,
-                by_alias=True,
-            )
+        # provided at initialization, pre-encoded in __init__.
+        return Response(
+            content=self._agent_card_json, media_type='application/json'
         )
 
     async def _handle_get_authenticated_extended_agent_card(
         self, request: Request
-    ) -> JSONResponse:
+    ) -> Response:
         """Handles GET requests for the authenticated extended agent card."""
         if not self.agent_card.supportsAuthenticatedExtendedCard:
-            return JSONResponse(
-                {'error': 'Extended agent card not supported or not enabled.'},
+            return Response(
+                content=_EXTENDED_CARD_NOT_SUPPORTED_BODY,
+                media_type='application/json',
                 status_code=404,
             )
 
         # If an explicit extended_agent_card is provided, serve that.
-        if self.extended_agent_card:
-            return JSONResponse(
-                self.extended_agent_card.model_dump(
-                    exclude_none=True,
-                    by_alias=True,
-                )
+        if self._extended_agent_card_json is not None:
+            return Response(
+                content=self._extended_agent_card_json,
+                media_type='application/json',
             )
         # If supportsAuthenticatedExtendedCard is true, but no specific
         # extended_agent_card was provided during server initialization,
         # return a 404
-        return JSONResponse(
-            {
-                'error': 'Authenticated extended agent card is supported but not configured on the server.'
-            },
+        return Response(
+            content=_EXTENDED_CARD_NOT_CONFIGURED_BODY,
+            media_type='application/json',
             status_code=404,
         )
 
@@ -9,7 +9,11 @@ try:
 except ImportError:
     StarletteBaseUser = MagicMock()  # type: ignore
 
+from starlette.requests import Request
+
+from a2a.auth.user import UnauthenticatedUser
 from a2a.server.apps.jsonrpc.jsonrpc_app import (
+    DefaultCallContextBuilder,
     JSONRPCApplication,  # Still needed for JSONRPCApplication default constructor arg
     StarletteUserProxy,
 )
@@ -54,6 +58,71 @@ class TestStarletteUserProxy:
         with pytest.raises(AttributeError, match='display_name'):
             _ = proxy.user_name
 
+    def test_starlette_user_proxy_has_no_instance_dict(self):
+        starlette_user_mock = MagicMock(spec=StarletteBaseUser)
+        starlette_user_mock.is_authenticated = True
+        starlette_user_mock.display_name = 'Test User'
+        proxy = StarletteUserProxy(starlette_user_mock)
+        assert not hasattr(proxy, '__dict__')
+
+
+# --- DefaultCallContextBuilder Tests ---
+
+
+def _make_request(
+    headers: list[tuple[bytes, bytes]], **scope_extras: object
+) -> Request:
+    return Request({'type': 'http', 'headers': headers, **scope_extras})
+
+
+class TestDefaultCallContextBuilder:
+    def test_build_without_auth_middleware_is_unauthenticated(self):
+        context = DefaultCallContextBuilder().build(_make_request([]))
+        assert isinstance(context.user, UnauthenticatedUser)
+        assert 'auth' not in context.state
+
+    def test_build_with_auth_scope_proxies_user(self):
+        starlette_user_mock = MagicMock(spec=StarletteBaseUser)
+        starlette_user_mock.is_authenticated = True
+        starlette_user_mock.display_name = 'alice'
+        auth = MagicMock()
+        request = _make_request([], user=starlette_user_mock, auth=auth)
+        context = DefaultCallContextBuilder().build(request)
+        assert isinstance(context.user, StarletteUserProxy)
+        assert context.user.is_authenticated is True
+        assert context.user.user_name == 'alice'
+        assert context.state['auth'] is auth
+
+    def test_build_exposes_request_headers(self):
+        request = _make_request(
+            [(b'x-api-key', b'secret'), (b'content-type', b'application/json')]
+        )
+        context = DefaultCallContextBuilder().build(request)
+        headers = context.state['headers']
+        assert headers['x-api-key'] == 'secret'
+        assert headers['X-API-Key'] == 'secret'
+        assert dict(headers) == {
+            'x-api-key': 'secret',
+            'content-type': 'application/json',
+        }
+
+    def test_build_headers_deduplicates_repeated_names(self):
+        request = _make_request([(b'accept', b'a'), (b'accept', b'b')])
+        headers = DefaultCallContextBuilder().build(request).state['headers']
+        assert len(headers) == 1
+        assert list(headers) == ['accept']
+        assert headers['accept'] == 'a'
+
+    def test_build_headers_missing_key_raises_key_error(self):
+        headers = (
+            DefaultCallContextBuilder()
+            .build(_make_request([]))
+            .state['headers']
+        )
+        assert 'x-missing' not in headers
+        with pytest.raises(KeyError):
+            _ = headers['x-missing']
+
 
 # --- JSONRPCApplication Tests (Selected) ---
 
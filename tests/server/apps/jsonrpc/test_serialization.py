@@ -1,8 +1,11 @@
+import json
+
 from unittest import mock
 
 import pytest
 
 from pydantic import ValidationError
+from starlette.requests import Request
 from starlette.testclient import TestClient
 
 from a2a.server.apps import A2AFastAPIApplication, A2AStarletteApplication
@@ -148,6 +151,67 @@ def test_handle_oversized_payload(agent_card_with_api_key: AgentCard):
         assert isinstance(e, (ConnectionResetError, RuntimeError))
 
 
+def test_handle_payload_above_max_body_bytes(
+    agent_card_with_api_key: AgentCard,
+):
+    """Test that bodies declaring a Content-Length above the limit are rejected."""
+
+    class SmallBodyApplication(A2AStarletteApplication):
+        MAX_BODY_BYTES = 64
+
+    handler = mock.AsyncMock()
+    app_instance = SmallBodyApplication(agent_card_with_api_key, handler)
+    client = TestClient(app_instance.build())
+
+    payload = {
+        'jsonrpc': '2.0',
+        'method': 'tasks/get',
+        'id': 1,
+        'params': {'id': 'a' * 100},
+    }
+    response = client.post('/', json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data['error']['code'] == InvalidRequestError().code
+    assert data['error']['message'] == 'Payload too large'
+    handler.on_get_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_handle_non_ascii_digit_content_length(
+    agent_card_with_api_key: AgentCard,
+):
+    """Test that a Content-Length of non-ASCII digits is ignored, not parsed."""
+    handler = mock.AsyncMock()
+    app_instance = A2AStarletteApplication(agent_card_with_api_key, handler)
+    body = json.dumps(
+        {
+            'jsonrpc': '2.0',
+            'method': 'tasks/get',
+            'id': 1,
+            'params': {'id': 'task1'},
+        }
+    ).encode()
+
+    async def receive() -> dict:
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    # Header values are decoded as latin-1, so b'\xb2' becomes '²', which
+    # str.isdigit() accepts but int() rejects.
+    request = Request(
+        {
+            'type': 'http',
+            'method': 'POST',
+            'headers': [(b'content-length', b'\xb2')],
+        },
+        receive,
+    )
+    response = await app_instance._handle_requests(request)
+    assert response.status_code == 200
+    assert json.loads(response.body)['id'] == 1
+    handler.on_get_task.assert_awaited_once()
+
+
 def test_handle_unicode_characters(agent_card_with_api_key: AgentCard):
     """Test handling of unicode characters in JSON payload."""
     handler = mock.AsyncMock()
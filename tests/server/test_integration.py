@@ -5,6 +5,7 @@ from unittest import mock
 
 import pytest
 
+from sse_starlette.sse import EventSourceResponse
 from starlette.authentication import (
     AuthCredentials,
     AuthenticationBackend,
@@ -236,6 +237,22 @@ def test_authenticated_extended_agent_card_endpoint_supported_with_specific_exte
     )
 
 
+def test_authenticated_extended_agent_card_endpoint_supported_but_not_configured(
+    agent_card: AgentCard, handler: mock.AsyncMock
+):
+    """Test extended card endpoint returns 404 JSON if no extended card is configured."""
+    agent_card.supportsAuthenticatedExtendedCard = True
+    app_instance = A2AStarletteApplication(agent_card, handler)
+    client = TestClient(app_instance.build())
+
+    response = client.get('/agent/authenticatedExtendedCard')
+    assert response.status_code == 404
+    assert response.headers['content-type'] == 'application/json'
+    assert response.json() == {
+        'error': 'Authenticated extended agent card is supported but not configured on the server.'
+    }
+
+
 def test_agent_card_custom_url(
     app: A2AStarletteApplication, agent_card: AgentCard
 ):
@@ -584,6 +601,59 @@ def test_server_auth(app: A2AStarletteApplication, handler: mock.AsyncMock):
     handler.on_message_send.assert_awaited_once()
 
 
+def test_server_auth_user_without_display_name(
+    app: A2AStarletteApplication, handler: mock.AsyncMock
+):
+    """Test that a Starlette user without display_name can still make requests."""
+
+    class IdentityOnlyUser(BaseUser):
+        @property
+        def is_authenticated(self) -> bool:
+            return True
+
+        @property
+        def identity(self) -> str:
+            return 'user-1'
+
+    class TestAuthMiddleware(AuthenticationBackend):
+        async def authenticate(
+            self, conn: HTTPConnection
+        ) -> tuple[AuthCredentials, BaseUser] | None:
+            return (AuthCredentials(['authenticated']), IdentityOnlyUser())
+
+    client = TestClient(
+        app.build(
+            middleware=[
+                Middleware(
+                    AuthenticationMiddleware, backend=TestAuthMiddleware()
+                )
+            ]
+        )
+    )
+
+    task_status = TaskStatus(**MINIMAL_TASK_STATUS)
+    handler.on_get_task.return_value = Task(
+        id='task1', contextId='ctx1', state='completed', status=task_status
+    )
+
+    response = client.post(
+        '/',
+        json={
+            'jsonrpc': '2.0',
+            'id': '123',
+            'method': 'tasks/get',
+            'params': {'id': 'task1'},
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert 'error' not in data
+    assert data['result']['id'] == 'task1'
+    context = handler.on_get_task.call_args.args[1]
+    assert context.user.is_authenticated is True
+
+
 # === STREAMING TESTS ===
 
 
@@ -677,6 +747,30 @@ async def test_message_send_stream(
         await asyncio.sleep(0.1)
 
 
+def test_message_send_stream_sets_send_timeout(
+    app: A2AStarletteApplication,
+) -> None:
+    """Test streaming responses time out on clients that stop reading."""
+
+    async def stream_generator():
+        yield TaskArtifactUpdateEvent.model_validate(
+            {
+                'artifact': Artifact(
+                    artifactId='artifact-0',
+                    parts=[Part(root=TextPart(**TEXT_PART_DATA))],
+                ),
+                'taskId': 'task_id',
+                'contextId': 'session-xyz',
+                'kind': 'artifact-update',
+            }
+        )
+
+    response = app._create_response(stream_generator())
+
+    assert isinstance(response, EventSourceResponse)
+    assert response.send_timeout == 30
+
+
 @pytest.mark.asyncio
 async def test_task_resubscription(
     app: A2AStarletteApplication, handler: mock.AsyncMock
@@ -850,6 +944,27 @@ def test_validation_error(client: TestClient):
     assert data['error']['code'] == InvalidRequestError().code
 
 
+def test_validation_error_echoes_request_id(client: TestClient):
+    """Test that a validation error for a known method keeps the request id."""
+    response = client.post(
+        '/',
+        json={
+            'jsonrpc': '2.0',
+            'id': 'req-42',
+            'method': 'tasks/get',
+            'params': {},
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data['id'] == 'req-42'
+    assert data['error']['code'] == InvalidRequestError().code
+    error_details = data['error']['data']
+    assert error_details[0]['type'] == 'missing'
+    assert error_details[0]['loc'] == ['params', 'id']
+    assert 'url' not in error_details[0]
+
+
 def test_unhandled_exception(client: TestClient, handler: mock.AsyncMock):
     """Test handling unhandled exception."""
     handler.on_get_task.side_effect = Exception('Unexpected error')
@@ -884,3 +999,18 @@ def test_non_dict_json(client: TestClient):
     data = response.json()
     assert 'error' in data
     assert data['error']['code'] == InvalidRequestError().code
+
+
+@pytest.mark.parametrize('body', [b'[]', b'1', b'"x"', b'null'])
+def test_non_object_json_reports_request_union_errors(
+    client: TestClient, body: bytes
+):
+    """Test that non-object bodies report errors against the A2ARequest union."""
+    response = client.post('/', content=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data.get('id') is None
+    assert data['error']['code'] == InvalidRequestError().code
+    error_details = data['error']['data']
+    assert error_details[0]['loc'][0] == 'SendMessageRequest'
+    assert '_JSONRPCEnvelope' not in response.text